@@ -27,6 +27,8 @@ License: MIT
 
 import sys
 import os
+import atexit
+import queue
 import time
 import signal
 import logging
@@ -35,7 +37,7 @@ import subprocess
 import configparser
 import threading
 from pathlib import Path
-from logging.handlers import RotatingFileHandler
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
 
 # Try to import RPi.GPIO, fall back to mock for development
 try:
@@ -199,27 +201,54 @@ class Config:
 # Logging Setup
 # ============================================================================
 
+class FastRotatingFileHandler(RotatingFileHandler):
+    """
+    RotatingFileHandler that avoids filesystem stat calls on every record.
+    
+    The stock handler checks os.path.exists/isfile on each emit; here the
+    open stream position is used and the full check only runs when the
+    record would push the file past maxBytes.
+    """
+    
+    def shouldRollover(self, record):
+        if self.maxBytes <= 0:
+            return False
+        if self.stream is None:
+            self.stream = self._open()
+        msg = "%s\n" % self.format(record)
+        self.stream.seek(0, 2)
+        if self.stream.tell() + len(msg) < self.maxBytes:
+            return False
+        return super().shouldRollover(record)
+
+
 def setup_logging(config):
     """
     Configure application logging with console and file handlers.
     
+    Records are passed through a queue to a background listener thread that
+    owns the handlers, so logging from the GPIO callback and timer threads
+    never blocks on console or file I/O.
+    
     Args:
         config: Config instance with logging settings
     """
     logger = logging.getLogger()
     logger.setLevel(config.LOG_LEVEL)
+    handlers = []
     
     # Console handler
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(logging.INFO)
     console_format = logging.Formatter('%(levelname)s: %(message)s')
     console_handler.setFormatter(console_format)
-    logger.addHandler(console_handler)
+    handlers.append(console_handler)
     
     # File handler with rotation
+    file_logging = False
     try:
         Path(config.LOG_FILE).parent.mkdir(parents=True, exist_ok=True)
-        file_handler = RotatingFileHandler(
+        file_handler = FastRotatingFileHandler(
             config.LOG_FILE,
             maxBytes=config.LOG_MAX_BYTES,
             backupCount=config.LOG_BACKUP_COUNT
@@ -229,9 +258,21 @@ def setup_logging(config):
             '%(asctime)s - %(levelname)s - %(message)s'
         )
         file_handler.setFormatter(file_format)
-        logger.addHandler(file_handler)
-        logging.info(f"Logging to file: {config.LOG_FILE}")
+        handlers.append(file_handler)
+        file_logging = True
     except PermissionError:
+        pass
+    
+    # Queue handler/listener pair (listener is stopped and drained at exit)
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+    logger.addHandler(QueueHandler(log_queue))
+    
+    if file_logging:
+        logging.info(f"Logging to file: {config.LOG_FILE}")
+    else:
         logging.warning(f"Cannot write to {config.LOG_FILE}, using console only")
     
     return logger
@@ -241,6 +282,25 @@ def setup_logging(config):
 # Utility Functions
 # ============================================================================
 
+# Supported sound file extensions (all four characters long)
+_SOUND_EXTS = frozenset({'.wav', '.mp3'})
+
+
+def _is_sound_file(name):
+    """
+    Check whether a filename has a supported sound extension.
+    
+    Only the 4-character suffix is lowercased, avoiding a full-name copy.
+    
+    Args:
+        name: File name (not a path)
+        
+    Returns:
+        bool: True if the extension is .wav or .mp3 (case-insensitive)
+    """
+    return len(name) >= 4 and name[-4:].lower() in _SOUND_EXTS
+
+
 def safe_read_file(filepath, default=None):
     """
     Read file content safely with error handling.
@@ -256,7 +316,7 @@ def safe_read_file(filepath, default=None):
         with open(filepath, 'r') as f:
             return f.read().strip()
     except FileNotFoundError:
-        logging.debug(f"File not found: {filepath}")
+        logging.debug("File not found: %s", filepath)
         return default
     except IOError as e:
         logging.error(f"Failed to read {filepath}: {e}")
@@ -316,7 +376,7 @@ def publish_sensor_value(sensor_id, value, is_binary=False, unit=None):
             check=True
         )
         
-        logging.debug(f"Published {sensor_id}={value} to MQTT")
+        logging.debug("Published %s=%s to MQTT", sensor_id, value)
         return True
         
     except subprocess.TimeoutExpired:
@@ -570,7 +630,11 @@ class MotionDetectionApp:
         self.gpio_manager = GPIOManager(config)
         self.sensor = None
         self.running = False
-        self.last_trigger_time = 0
+        self._stop_event = threading.Event()  # Wakes the main loop on stop()
+        # Resolved once; used for the path traversal check on every playback
+        self._real_sound_dir = os.path.realpath(config.SOUND_DIR)
+        self.last_trigger_time = 0  # Wall-clock time, persisted to TIMER_FILE
+        self._last_trigger_monotonic = float('-inf')  # Used for cooldown checks
         # OFF-timer state (thread-safe access via timer_lock)
         self.off_timer = None  # Timer for delayed OFF message
         self.timer_lock = threading.Lock()  # Thread-safe timer access
@@ -604,6 +668,11 @@ class MotionDetectionApp:
             # Sanitize timer file content before logging (limit to 50 chars)
             sanitized_content = last_time_str[:50] if last_time_str else ""
             logging.warning(f"Invalid timer file content (first 50 chars): {sanitized_content!r}, reset to 0")
+        
+        # Map persisted wall-clock trigger time onto the monotonic clock
+        if self.last_trigger_time > 0:
+            elapsed = max(0, int(time.time()) - self.last_trigger_time)
+            self._last_trigger_monotonic = time.monotonic() - elapsed
     
     def _validate_sound_directory(self):
         """Validate sound directory exists and contains sound files."""
@@ -611,10 +680,11 @@ class MotionDetectionApp:
             logging.warning(f"Sound directory not found: {self.config.SOUND_DIR}")
             return
         
-        sound_files = [
-            f for f in os.listdir(self.config.SOUND_DIR)
-            if f.lower().endswith(('.wav', '.mp3'))
-        ]
+        with os.scandir(self.config.SOUND_DIR) as entries:
+            sound_files = [
+                e.name for e in entries
+                if e.is_file(follow_symlinks=False) and _is_sound_file(e.name)
+            ]
         
         if not sound_files:
             logging.warning(f"No sound files in {self.config.SOUND_DIR}")
@@ -645,7 +715,7 @@ class MotionDetectionApp:
                 self._publish_off_message
             )
             self.off_timer.start()
-            logging.debug(f"OFF timer started ({self.config.MQTT_OFF_DELAY}s)")
+            logging.debug("OFF timer started (%ss)", self.config.MQTT_OFF_DELAY)
     
     def _publish_off_message(self):
         """
@@ -676,8 +746,8 @@ class MotionDetectionApp:
             channel: GPIO channel that triggered the event
         """
         try:
-            now = int(time.time())
-            time_since_last = now - self.last_trigger_time
+            now = time.monotonic()
+            time_since_last = now - self._last_trigger_monotonic
             
             # Always log motion detection
             logging.info(f"Motion detected on GPIO{channel}")
@@ -690,7 +760,7 @@ class MotionDetectionApp:
             
             # Check cooldown for sound playback only
             if time_since_last < self.config.COOLDOWN_SECONDS:
-                remaining = self.config.COOLDOWN_SECONDS - time_since_last
+                remaining = int(self.config.COOLDOWN_SECONDS - time_since_last)
                 logging.info(f"Sound cooldown active ({remaining}s remaining), skipping playback")
                 return
             
@@ -698,8 +768,9 @@ class MotionDetectionApp:
             self.play_sound_for_motion()
             
             # Update last trigger time for sound cooldown
-            self.last_trigger_time = now
-            safe_write_file(self.config.TIMER_FILE, now)
+            self._last_trigger_monotonic = now
+            self.last_trigger_time = int(time.time())
+            safe_write_file(self.config.TIMER_FILE, self.last_trigger_time)
             
         except Exception as e:
             logging.error(f"Error in motion callback: {e}")
@@ -711,10 +782,11 @@ class MotionDetectionApp:
         Only called after cooldown period has expired.
         """
         try:
-            sound_files = [
-                f for f in os.listdir(self.config.SOUND_DIR)
-                if f.lower().endswith(('.wav', '.mp3'))
-            ]
+            with os.scandir(self.config.SOUND_DIR) as entries:
+                sound_files = [
+                    e.name for e in entries
+                    if e.is_file(follow_symlinks=False) and _is_sound_file(e.name)
+                ]
             
             if not sound_files:
                 logging.error(f"No sound files available in {self.config.SOUND_DIR}")
@@ -746,7 +818,7 @@ class MotionDetectionApp:
             
             # Ensure file is within expected sound directory (prevent path traversal)
             real_path = os.path.realpath(filepath)
-            real_sound_dir = os.path.realpath(self.config.SOUND_DIR)
+            real_sound_dir = self._real_sound_dir
             
             # Use os.path.commonpath to properly check directory containment
             try:
@@ -767,16 +839,18 @@ class MotionDetectionApp:
             # -q: quiet mode (no status output)
             # The following parameters help prevent popping/crackling on I2S audio devices
             # like the Adafruit Sound Bonnet by ensuring proper buffer management
+            # stdout is discarded; stderr is only kept for error reporting
             result = subprocess.run(
                 ['aplay', '-q', filepath],
-                capture_output=True,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
                 timeout=10,
                 check=False
             )
             
             if result.returncode != 0:
                 # Sanitize stderr output (limit length, remove newlines)
-                stderr_msg = result.stderr.decode('utf-8', errors='replace')[:200].replace('\n', ' ')
+                stderr_msg = result.stderr[:200].decode('utf-8', errors='replace').replace('\n', ' ')
                 logging.error(f"Audio playback failed: {stderr_msg}")
         except subprocess.TimeoutExpired:
             logging.error("Audio playback timed out")
@@ -793,17 +867,27 @@ class MotionDetectionApp:
         # Start sensor monitoring
         self.sensor.start_monitoring()
         
-        # Main loop - sleep and let events handle everything
+        # Main loop - wait and let events handle everything
         # Signal handlers (SIGINT, SIGTERM) will trigger graceful shutdown
         try:
             while self.running:
-                time.sleep(self.config.MAIN_LOOP_SLEEP)
+                if self._stop_event.wait(self.config.MAIN_LOOP_SLEEP):
+                    break
                 
         except KeyboardInterrupt:
             logging.info("Keyboard interrupt received")
         finally:
             self.stop()
     
+    def request_shutdown(self):
+        """
+        Ask the main loop to stop.
+        
+        Safe to call from a signal handler: it only sets an event, and the
+        main loop performs the actual cleanup via stop().
+        """
+        self._stop_event.set()
+    
     def stop(self):
         """Stop application and clean up resources."""
         if not self.running:
@@ -811,6 +895,7 @@ class MotionDetectionApp:
         
         logging.info("Stopping motion detection service...")
         self.running = False
+        self._stop_event.set()
         
         # Cancel any pending OFF timer
         self._cancel_off_timer()
@@ -836,6 +921,10 @@ def signal_handler(signum, frame):
     """
     Handle shutdown signals gracefully.
     
+    Cleanup is not done here: GPIO and subprocess calls are not safe to
+    re-enter from signal context, so the running application is only asked
+    to shut down and its main loop calls stop().
+    
     Args:
         signum: Signal number
         frame: Current stack frame
@@ -844,9 +933,9 @@ def signal_handler(signum, frame):
     logging.info(f"Received signal: {signal_name}")
     
     if app_instance:
-        app_instance.stop()
-    
-    sys.exit(0)
+        app_instance.request_shutdown()
+    else:
+        sys.exit(0)
 
 
 # ============================================================================
@@ -18,10 +18,72 @@ import os
 import sys
 import subprocess
 import logging
-import configparser
 import re
+import filecmp
+import shutil
+import tempfile
 from pathlib import Path
 
+# Boot config options and the config.txt directive each one enables
+BOOT_DIRECTIVES = (
+    ('disable_i2c', 'dtparam=i2c_arm=off'),
+    ('disable_i2s', 'dtparam=i2s=off'),
+    ('disable_spi', 'dtparam=spi=off'),
+    ('disable_audio', 'dtparam=audio=off'),
+    ('disable_camera', 'camera_auto_detect=0'),
+    ('disable_wifi', 'dtoverlay=disable-wifi'),
+    ('disable_bluetooth', 'dtoverlay=disable-bt'),
+)
+
+# Comment or directive lines that belong to an existing optimization section
+_OPT_LINE_RE = re.compile(r'#|dtparam|dtoverlay|gpu_mem|camera|display_auto_detect')
+
+
+# INI syntax used by optimize.conf
+_SECTION_RE = re.compile(r'\[([^\]]+)\]$')
+_OPTION_RE = re.compile(r'([^=:]+?)\s*[=:]\s*(.*)$')
+
+
+def _parse_ini(path):
+    """Parse a simple INI file into {section: {option: value}}
+    
+    Supports the subset of INI syntax used by optimize.conf: [Section]
+    headers, key=value (or key: value) options, indented continuation
+    lines and full-line # or ; comments. As with configparser, option
+    names are lowercased and continuation lines are joined with newlines.
+    """
+    sections = {}
+    current = None
+    option = None
+    
+    with open(path, 'r') as f:
+        for lineno, raw_line in enumerate(f, 1):
+            line = raw_line.strip()
+            if not line or line[0] in '#;':
+                continue
+            
+            # Indented lines continue the previous option's value
+            if option is not None and raw_line[0].isspace():
+                current[option] += '\n' + line
+                continue
+            
+            match = _SECTION_RE.match(line)
+            if match:
+                current = sections.setdefault(match.group(1).strip(), {})
+                option = None
+                continue
+            
+            match = _OPTION_RE.match(line)
+            if not match:
+                raise ValueError(f"line {lineno}: cannot parse {line!r}")
+            if current is None:
+                raise ValueError(f"line {lineno}: option outside of a section")
+            option = match.group(1).lower()
+            current[option] = match.group(2)
+    
+    return sections
+
+
 class Config:
     """Configuration management for system optimization"""
     
@@ -54,15 +116,17 @@ class Config:
     
     def __init__(self, config_path='/etc/luigi/system/optimization/optimize.conf'):
         self.config_path = config_path
-        self.config = configparser.ConfigParser()
         
         # Load defaults
-        self.config.read_dict(self.DEFAULT_CONFIG)
+        self.config = {
+            section: dict(options) for section, options in self.DEFAULT_CONFIG.items()
+        }
         
         # Try to load config file
         if os.path.exists(config_path):
             try:
-                self.config.read(config_path)
+                for section, options in _parse_ini(config_path).items():
+                    self.config.setdefault(section, {}).update(options)
             except Exception as e:
                 print(f"Warning: Could not read config file {config_path}: {e}")
                 print("Using default configuration")
@@ -71,7 +135,7 @@ class Config:
     
     def get(self, section, option):
         """Get configuration value"""
-        return self.config.get(section, option)
+        return self.config[section][option]
     
     def get_list(self, section, option):
         """Get configuration value as a list (comma-separated)"""
@@ -102,10 +166,10 @@ class SystemOptimizer:
         
         # Create log directory if it doesn't exist
         log_dir = os.path.dirname(log_file)
-        if log_dir and not os.path.exists(log_dir):
+        if log_dir:
             try:
-                os.makedirs(log_dir, mode=0o755)
-            except Exception as e:
+                os.makedirs(log_dir, mode=0o755, exist_ok=True)
+            except OSError as e:
                 print(f"Warning: Could not create log directory {log_dir}: {e}")
                 log_file = '/tmp/system-optimization.log'
         
@@ -130,26 +194,38 @@ class SystemOptimizer:
         ))
         self.logger.addHandler(console_handler)
     
-    def run_command(self, cmd, check=True):
-        """Run a system command"""
+    def run_command(self, cmd, check=True, capture=False, env=None):
+        """Run a system command
+        
+        Output is only captured (and decoded) when capture is True; otherwise
+        stdout is discarded and stderr is kept as bytes for error reporting.
+        """
         if self.dry_run:
             self.logger.info(f"[DRY RUN] Would execute: {' '.join(cmd)}")
             return True
         
+        if capture:
+            output_args = {'capture_output': True, 'text': True}
+        else:
+            output_args = {'stdout': subprocess.DEVNULL, 'stderr': subprocess.PIPE}
+        
         try:
             result = subprocess.run(
                 cmd,
                 check=check,
-                capture_output=True,
-                text=True,
-                timeout=30
+                timeout=30,
+                env=env,
+                **output_args
             )
-            if result.stdout:
+            if capture and result.stdout:
                 self.logger.debug(f"Command output: {result.stdout.strip()}")
             return True
         except subprocess.CalledProcessError as e:
+            stderr = e.stderr
+            if isinstance(stderr, bytes):
+                stderr = stderr.decode('utf-8', errors='replace')
             self.logger.error(f"Command failed: {' '.join(cmd)}")
-            self.logger.error(f"Error: {e.stderr}")
+            self.logger.error(f"Error: {stderr}")
             return False
         except subprocess.TimeoutExpired:
             self.logger.error(f"Command timed out: {' '.join(cmd)}")
@@ -158,18 +234,29 @@ class SystemOptimizer:
             self.logger.error(f"Unexpected error running command: {e}")
             return False
     
-    def service_exists(self, service_name):
-        """Check if a systemd service exists"""
+    def list_unit_files(self):
+        """Get the set of installed systemd unit names (one systemctl call)"""
         try:
             result = subprocess.run(
-                ['systemctl', 'list-unit-files', service_name],
+                ['systemctl', 'list-unit-files', '--no-legend'],
                 capture_output=True,
                 text=True,
                 timeout=10
             )
-            return service_name in result.stdout
         except Exception:
-            return False
+            return set()
+        
+        units = set()
+        for line in result.stdout.splitlines():
+            fields = line.split()
+            if not fields:
+                continue
+            unit = fields[0]
+            units.add(unit)
+            # Services are usually configured without the .service suffix
+            if unit.endswith('.service'):
+                units.add(unit[:-len('.service')])
+        return units
     
     def service_is_enabled(self, service_name):
         """Check if a service is enabled"""
@@ -209,13 +296,16 @@ class SystemOptimizer:
         fail_count = 0
         skip_count = 0
         
+        # Look up installed units once instead of once per service
+        existing_units = self.list_unit_files() if disable_list else set()
+        
         # Disable services
         for service in disable_list:
             if not service:
                 continue
             
             # Check if service exists before trying to disable
-            if not self.service_exists(service):
+            if service not in existing_units:
                 self.logger.info(f"Service {service} not found, skipping")
                 skip_count += 1
                 continue
@@ -261,11 +351,7 @@ class SystemOptimizer:
             '/boot/config.txt'
         ]
         
-        config_path = None
-        for path in config_paths:
-            if os.path.exists(path):
-                config_path = path
-                break
+        config_path = next((p for p in config_paths if Path(p).is_file()), None)
         
         if not config_path:
             self.logger.warning("Boot config file not found, skipping boot optimization")
@@ -277,41 +363,11 @@ class SystemOptimizer:
             self.logger.info("[DRY RUN] Would modify boot configuration")
             return True
         
-        # Read existing config
-        try:
-            with open(config_path, 'r') as f:
-                lines = f.readlines()
-        except Exception as e:
-            self.logger.error(f"Could not read boot config: {e}")
-            return False
-        
-        # Create backup
-        backup_path = f"{config_path}.bak"
-        try:
-            with open(backup_path, 'w') as f:
-                f.writelines(lines)
-            self.logger.info(f"Created backup: {backup_path}")
-        except Exception as e:
-            self.logger.error(f"Could not create backup: {e}")
-            return False
-        
         # Prepare optimizations
-        optimizations = []
-        
-        if self.config.get_bool('Boot', 'disable_i2c'):
-            optimizations.append('dtparam=i2c_arm=off')
-        if self.config.get_bool('Boot', 'disable_i2s'):
-            optimizations.append('dtparam=i2s=off')
-        if self.config.get_bool('Boot', 'disable_spi'):
-            optimizations.append('dtparam=spi=off')
-        if self.config.get_bool('Boot', 'disable_audio'):
-            optimizations.append('dtparam=audio=off')
-        if self.config.get_bool('Boot', 'disable_camera'):
-            optimizations.append('camera_auto_detect=0')
-        if self.config.get_bool('Boot', 'disable_wifi'):
-            optimizations.append('dtoverlay=disable-wifi')
-        if self.config.get_bool('Boot', 'disable_bluetooth'):
-            optimizations.append('dtoverlay=disable-bt')
+        optimizations = [
+            directive for key, directive in BOOT_DIRECTIVES
+            if self.config.get_bool('Boot', key)
+        ]
         
         gpu_mem = self.config.get('Boot', 'gpu_mem')
         if gpu_mem:
@@ -321,57 +377,113 @@ class SystemOptimizer:
             self.logger.info("No boot optimizations configured")
             return True
         
-        # Add optimization section to config
-        new_lines = lines.copy()
-        
-        # Check if our section already exists
+        # Stream the existing config into a temp file in the same directory,
+        # dropping any previous optimization section and appending a new one
         section_marker = '# Luigi System Optimization'
-        has_section = any(section_marker in line for line in lines)
+        has_section = False
+        tmp_path = None
+        
+        try:
+            with open(config_path, 'r') as src, tempfile.NamedTemporaryFile(
+                'w', dir=os.path.dirname(config_path), prefix='.config.txt.', delete=False
+            ) as dst:
+                tmp_path = dst.name
+                skip = False
+                last_line = '\n'
+                
+                for line in src:
+                    if section_marker in line:
+                        has_section = True
+                        skip = True
+                    elif skip and line.strip():
+                        # Check if this line is NOT an optimization line
+                        if not _OPT_LINE_RE.match(line):
+                            skip = False
+                    
+                    if not skip:
+                        dst.write(line)
+                        last_line = line
+                
+                # Add new section, separated by a single blank line so that
+                # re-running produces identical output
+                if not last_line.endswith('\n'):
+                    dst.write('\n')
+                if last_line.strip():
+                    dst.write('\n')
+                dst.write(f'{section_marker}\n')
+                for opt in optimizations:
+                    dst.write(f'{opt}\n')
+                
+                # Make sure the data is on disk before it replaces the
+                # original; /boot/firmware is FAT and power loss is common
+                dst.flush()
+                os.fsync(dst.fileno())
+            
+            shutil.copymode(config_path, tmp_path)
+        except Exception as e:
+            self.logger.error(f"Could not write boot config: {e}")
+            self._remove_file(tmp_path)
+            return False
+        
+        # Leave the file (and SD card) untouched if nothing would change
+        try:
+            unchanged = filecmp.cmp(tmp_path, config_path, shallow=False)
+        except OSError:
+            unchanged = False
+        if unchanged:
+            self._remove_file(tmp_path)
+            self.logger.info("Boot config already up to date")
+            return True
         
         if has_section:
             self.logger.info("Optimization section already exists, updating")
-            # Remove old section
-            new_lines = []
-            skip = False
-            optimization_prefixes = ('dtparam', 'dtoverlay', 'gpu_mem', 'camera', 'display_auto_detect')
-            
-            for line in lines:
-                if section_marker in line:
-                    skip = True
-                elif skip and line.strip():
-                    # Check if this line is NOT an optimization line
-                    if not line.startswith('#') and not line.startswith(optimization_prefixes):
-                        skip = False
-                
-                if not skip:
-                    new_lines.append(line)
         
-        # Add new section
-        new_lines.append('\n')
-        new_lines.append(f'{section_marker}\n')
-        for opt in optimizations:
-            new_lines.append(f'{opt}\n')
+        # Create backup (copy2 copies in-kernel where possible and keeps
+        # the original timestamps and permissions)
+        backup_path = f"{config_path}.bak"
+        try:
+            shutil.copy2(config_path, backup_path)
+            self.logger.info(f"Created backup: {backup_path}")
+        except Exception as e:
+            self.logger.error(f"Could not create backup: {e}")
+            self._remove_file(tmp_path)
+            return False
         
-        # Write updated config
+        # Swap in the updated config with a rename (original is untouched on
+        # failure) and sync the directory so the rename itself is durable
         try:
-            with open(config_path, 'w') as f:
-                f.writelines(new_lines)
+            os.replace(tmp_path, config_path)
+            self._fsync_dir(os.path.dirname(config_path))
             self.logger.info(f"Updated boot config with {len(optimizations)} optimizations")
             self.logger.info("Reboot required for boot config changes to take effect")
             return True
         except Exception as e:
             self.logger.error(f"Could not write boot config: {e}")
-            # Restore from backup
-            try:
-                with open(backup_path, 'r') as f:
-                    backup_lines = f.readlines()
-                with open(config_path, 'w') as f:
-                    f.writelines(backup_lines)
-                self.logger.info("Restored from backup")
-            except Exception as e2:
-                self.logger.error(f"Could not restore from backup: {e2}")
+            self._remove_file(tmp_path)
             return False
     
+    def _fsync_dir(self, path):
+        """Flush directory entries (e.g. a rename) to disk, ignoring errors"""
+        try:
+            fd = os.open(path, os.O_RDONLY)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+        except OSError as e:
+            self.logger.warning(f"Could not sync directory {path}: {e}")
+    
+    def _remove_file(self, path):
+        """Remove a file if it exists, ignoring errors"""
+        if not path:
+            return
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            self.logger.warning(f"Could not remove {path}: {e}")
+    
     def blacklist_modules(self):
         """Blacklist kernel modules"""
         self.logger.info("=== Blacklisting Kernel Modules ===")
@@ -439,18 +551,15 @@ class SystemOptimizer:
         
         self.logger.info(f"Removing packages: {', '.join(packages_to_remove)}")
         
-        # Build apt-get command
-        cmd = ['apt-get', 'remove', '--purge', '-y'] + packages_to_remove
+        # Purge and autoremove in a single apt-get run so the package
+        # database is loaded and dependencies are resolved only once
+        cmd = ['apt-get', 'purge', '--autoremove', '-y'] + packages_to_remove
+        env = dict(os.environ, DEBIAN_FRONTEND='noninteractive')
         
-        if not self.run_command(cmd, check=False):
+        if not self.run_command(cmd, check=False, env=env):
             self.logger.error("Package removal failed")
             return False
         
-        # Run autoremove
-        self.logger.info("Running autoremove to clean up dependencies")
-        if not self.run_command(['apt-get', 'autoremove', '-y'], check=False):
-            self.logger.warning("Autoremove failed, but continuing")
-        
         return True
     
     def optimize(self):
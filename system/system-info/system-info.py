@@ -29,21 +29,86 @@ License: MIT
 
 import sys
 import os
+import re
 import time
 import signal
 import logging
+import socket
 import subprocess
-import configparser
+import threading
+import concurrent.futures
 import psutil
 from pathlib import Path
 from logging.handlers import RotatingFileHandler
 from datetime import datetime, timedelta
 
+# paho-mqtt is optional; without it values are published via luigi-publish
+try:
+    import paho.mqtt.client as mqtt
+except ImportError:
+    mqtt = None
+
 
 # ============================================================================
 # Configuration
 # ============================================================================
 
+_SECTION_RE = re.compile(r'\[([^\]]+)\]$')
+_OPTION_RE = re.compile(r'([^=:]+?)\s*[=:]\s*(.*)$')
+
+
+def _parse_ini(path):
+    """
+    Parse a simple INI file into {section: {option: value}}.
+    
+    Supports the subset of INI syntax used by system-info.conf and
+    ha-mqtt.conf: [Section] headers, key=value (or key: value) options,
+    indented continuation lines and full-line # or ; comments. As with
+    configparser, option names are lowercased and continuation lines are
+    joined with newlines.
+    
+    Args:
+        path: Path to the INI file
+        
+    Returns:
+        dict: Option values keyed by section, then option name
+        
+    Raises:
+        OSError: If the file cannot be read
+        ValueError: If a line cannot be parsed
+    """
+    sections = {}
+    current = None
+    option = None
+    
+    with open(path, 'r') as f:
+        for lineno, raw_line in enumerate(f, 1):
+            line = raw_line.strip()
+            if not line or line[0] in '#;':
+                continue
+            
+            # Indented lines continue the previous option's value
+            if option is not None and raw_line[0].isspace():
+                current[option] += '\n' + line
+                continue
+            
+            match = _SECTION_RE.match(line)
+            if match:
+                current = sections.setdefault(match.group(1).strip(), {})
+                option = None
+                continue
+            
+            match = _OPTION_RE.match(line)
+            if not match:
+                raise ValueError(f"line {lineno}: cannot parse {line!r}")
+            if current is None:
+                raise ValueError(f"line {lineno}: option outside of a section")
+            option = match.group(1).lower()
+            current[option] = match.group(2)
+    
+    return sections
+
+
 class Config:
     """Load application configuration from file with fallback to defaults."""
     
@@ -53,7 +118,6 @@ class Config:
     DEFAULT_LOG_MAX_BYTES = 10 * 1024 * 1024  # 10MB
     DEFAULT_LOG_BACKUP_COUNT = 5
     DEFAULT_PUBLISH_INTERVAL = 300  # 5 minutes in seconds
-    DEFAULT_MAIN_LOOP_SLEEP = 60    # Check every minute
     
     def __init__(self, module_path="system/system-info"):
         """
@@ -76,44 +140,58 @@ class Config:
         self.LOG_MAX_BYTES = self.DEFAULT_LOG_MAX_BYTES
         self.LOG_BACKUP_COUNT = self.DEFAULT_LOG_BACKUP_COUNT
         self.PUBLISH_INTERVAL = self.DEFAULT_PUBLISH_INTERVAL
-        self.MAIN_LOOP_SLEEP = self.DEFAULT_MAIN_LOOP_SLEEP
         
-        # Try to read config file
-        if os.path.exists(self.config_file):
-            try:
-                parser = configparser.ConfigParser()
-                parser.read(self.config_file)
-                
-                # Load logging settings
-                if parser.has_section('Logging'):
-                    self.LOG_FILE = parser.get('Logging', 'log_file', 
-                                               fallback=self.DEFAULT_LOG_FILE)
-                    self.LOG_LEVEL = parser.get('Logging', 'log_level', 
-                                                fallback=self.DEFAULT_LOG_LEVEL)
-                    self.LOG_MAX_BYTES = parser.getint('Logging', 'log_max_bytes', 
-                                                       fallback=self.DEFAULT_LOG_MAX_BYTES)
-                    self.LOG_BACKUP_COUNT = parser.getint('Logging', 'log_backup_count', 
-                                                         fallback=self.DEFAULT_LOG_BACKUP_COUNT)
-                
-                # Load timing settings
-                if parser.has_section('Timing'):
-                    self.PUBLISH_INTERVAL = parser.getint('Timing', 'publish_interval_seconds', 
-                                                         fallback=self.DEFAULT_PUBLISH_INTERVAL)
-                    self.MAIN_LOOP_SLEEP = parser.getint('Timing', 'main_loop_sleep_seconds', 
-                                                        fallback=self.DEFAULT_MAIN_LOOP_SLEEP)
-                
-                logging.info(f"Configuration loaded from {self.config_file}")
-            except Exception as e:
-                logging.warning(f"Error loading config file {self.config_file}: {e}")
-                logging.warning("Using default configuration")
-        else:
+        # Try to read config file (a missing file just means defaults)
+        try:
+            sections = _parse_ini(self.config_file)
+            
+            # Load logging settings
+            logging_section = sections.get('Logging', {})
+            self.LOG_FILE = logging_section.get('log_file', self.DEFAULT_LOG_FILE)
+            self.LOG_LEVEL = logging_section.get('log_level', self.DEFAULT_LOG_LEVEL)
+            self.LOG_MAX_BYTES = int(logging_section.get('log_max_bytes',
+                                                         self.DEFAULT_LOG_MAX_BYTES))
+            self.LOG_BACKUP_COUNT = int(logging_section.get('log_backup_count',
+                                                            self.DEFAULT_LOG_BACKUP_COUNT))
+            
+            # Load timing settings
+            timing_section = sections.get('Timing', {})
+            self.PUBLISH_INTERVAL = int(timing_section.get('publish_interval_seconds',
+                                                           self.DEFAULT_PUBLISH_INTERVAL))
+            
+            logging.info(f"Configuration loaded from {self.config_file}")
+        except FileNotFoundError:
             logging.info(f"Config file not found: {self.config_file}, using defaults")
+        except Exception as e:
+            logging.warning(f"Error loading config file {self.config_file}: {e}")
+            logging.warning("Using default configuration")
 
 
 # ============================================================================
 # Logging Configuration
 # ============================================================================
 
+class FastRotatingFileHandler(RotatingFileHandler):
+    """
+    RotatingFileHandler that avoids filesystem stat calls on every record.
+    
+    The stock handler checks os.path.exists/isfile on each emit; here the
+    open stream position is used and the full check only runs when the
+    record would push the file past maxBytes.
+    """
+    
+    def shouldRollover(self, record):
+        if self.maxBytes <= 0:
+            return False
+        if self.stream is None:
+            self.stream = self._open()
+        msg = "%s\n" % self.format(record)
+        self.stream.seek(0, 2)
+        if self.stream.tell() + len(msg) < self.maxBytes:
+            return False
+        return super().shouldRollover(record)
+
+
 def setup_logging(config):
     """
     Configure logging with rotation and multiple outputs.
@@ -130,34 +208,41 @@ def setup_logging(config):
             # Fall back to /tmp if we can't create /var/log
             config.LOG_FILE = "/tmp/system-info.log"
     
+    # Shared by all handlers
+    formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+    
+    # Resolve the level name once; unknown names fall back to INFO
+    log_level = getattr(logging, config.LOG_LEVEL.upper(), None)
+    if not isinstance(log_level, int):
+        log_level = logging.INFO
+    
     # Create rotating file handler
     try:
-        file_handler = RotatingFileHandler(
+        file_handler = FastRotatingFileHandler(
             config.LOG_FILE,
             maxBytes=config.LOG_MAX_BYTES,
             backupCount=config.LOG_BACKUP_COUNT
         )
-        file_handler.setFormatter(logging.Formatter(
-            '%(asctime)s - %(levelname)s - %(message)s'
-        ))
+        file_handler.setFormatter(formatter)
     except (OSError, PermissionError) as e:
         print(f"Warning: Could not create log file {config.LOG_FILE}: {e}")
         file_handler = None
     
     # Console handler for development/debugging
     console_handler = logging.StreamHandler()
-    console_handler.setFormatter(logging.Formatter(
-        '%(asctime)s - %(levelname)s - %(message)s'
-    ))
+    console_handler.setFormatter(formatter)
     
     # Configure root logger
     handlers = [console_handler]
     if file_handler:
         handlers.append(file_handler)
     
+    # force: Config() has already logged through the root logger, which
+    # installed a default stderr handler that would otherwise stay in place
     logging.basicConfig(
-        level=getattr(logging, config.LOG_LEVEL.upper(), logging.INFO),
-        handlers=handlers
+        level=log_level,
+        handlers=handlers,
+        force=True
     )
     
     logging.info("System Info Module started")
@@ -168,12 +253,294 @@ def setup_logging(config):
 # MQTT Publishing
 # ============================================================================
 
+# Broker settings are shared with ha-mqtt (same override as luigi-publish)
+HA_MQTT_CONFIG_FILE = os.environ.get('MQTT_CONFIG_FILE', '/etc/luigi/iot/ha-mqtt/ha-mqtt.conf')
+
+# Shared MQTT client, created on first publish (guarded by _MQTT_LOCK)
+_MQTT_CLIENT = None
+_MQTT_SETTINGS = None
+_MQTT_UNAVAILABLE = False
+_MQTT_LOCK = threading.Lock()
+_MQTT_CONNECTED = threading.Event()
+
+
+def _load_broker_settings(config_file):
+    """
+    Read broker connection settings from the ha-mqtt configuration file.
+    
+    Uses the same file, defaults and ${HOSTNAME} expansion as luigi-publish
+    so that both publish paths reach the same broker and topics.
+    
+    Args:
+        config_file: Path to ha-mqtt.conf
+        
+    Returns:
+        dict: Broker settings, or None if the file cannot be read
+    """
+    try:
+        sections = _parse_ini(config_file)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logging.warning("Could not read MQTT config %s: %s", config_file, e)
+        return None
+    
+    hostname = socket.gethostname()
+    
+    def get(section, key, default):
+        value = sections.get(section, {}).get(key.lower(), default).strip()
+        value = value.strip('"').strip("'")
+        return value.replace('${HOSTNAME}', hostname)
+    
+    # Defaults match load_config in ha-mqtt's mqtt_helpers.sh
+    host = get('Broker', 'HOST', 'homeassistant.local')
+    if not host:
+        logging.warning("MQTT HOST not configured in %s", config_file)
+        return None
+    
+    try:
+        port = int(get('Broker', 'PORT', '1883'))
+        keepalive = int(get('Client', 'KEEPALIVE', '60'))
+        qos = int(get('Client', 'QOS', '1'))
+        reconnect_min = int(get('Connection', 'RECONNECT_DELAY_MIN', '5'))
+        reconnect_max = int(get('Connection', 'RECONNECT_DELAY_MAX', '300'))
+        connect_timeout = int(get('Connection', 'CONNECTION_TIMEOUT', '10'))
+    except ValueError as e:
+        logging.warning("Invalid numeric setting in MQTT config %s: %s", config_file, e)
+        return None
+    
+    base_topic = get('Topics', 'BASE_TOPIC', 'homeassistant')
+    device_prefix = get('Topics', 'DEVICE_PREFIX', 'luigi')
+    
+    return {
+        'host': host,
+        'port': port,
+        'tls': get('Broker', 'TLS', 'no') == 'yes',
+        'ca_cert': get('Broker', 'CA_CERT', ''),
+        'username': get('Authentication', 'USERNAME', 'luigi'),
+        'password': get('Authentication', 'PASSWORD', ''),
+        # Distinct from luigi-publish's client id so the two never kick
+        # each other off the broker
+        'client_id': f"{get('Client', 'CLIENT_ID', f'luigi_{hostname}')}_system_info",
+        'keepalive': keepalive,
+        'qos': qos,
+        'reconnect_min': reconnect_min,
+        'reconnect_max': reconnect_max,
+        'connect_timeout': connect_timeout,
+        # Same topic layout as build_topic in ha-mqtt's mqtt_helpers.sh
+        'state_topic': f"{base_topic}/sensor/{device_prefix}-{hostname}/{{sensor_id}}/state",
+    }
+
+
+def _mqtt_reason(reason_code, connack=False):
+    """
+    Describe an MQTT reason/return code for logging.
+    
+    Args:
+        reason_code: ReasonCode (paho-mqtt 2.x) or int return code (1.x)
+        connack: Whether an int code is a CONNACK result rather than an
+            MQTT_ERR_* value
+        
+    Returns:
+        str: Human readable description
+    """
+    if isinstance(reason_code, int):
+        if connack:
+            return mqtt.connack_string(reason_code)
+        return mqtt.error_string(reason_code)
+    return str(reason_code)
+
+
+def _on_mqtt_connect(client, userdata, flags, reason_code, properties=None):
+    """Log the broker's answer to each (re)connection attempt."""
+    if reason_code == 0:
+        logging.info("MQTT connected to %s:%s", userdata['host'], userdata['port'])
+        _MQTT_CONNECTED.set()
+    else:
+        logging.error("MQTT connection to %s:%s refused: %s",
+                      userdata['host'], userdata['port'], _mqtt_reason(reason_code, connack=True))
+
+
+def _on_mqtt_connect_fail(client, userdata):
+    """Log connection attempts that fail before the broker answers."""
+    logging.error("MQTT connection to %s:%s failed (network or TLS error), retrying",
+                  userdata['host'], userdata['port'])
+
+
+def _on_mqtt_disconnect(userdata, reason_code):
+    """Log a lost or closed broker connection."""
+    _MQTT_CONNECTED.clear()
+    if reason_code == 0:
+        logging.info("MQTT disconnected from %s:%s", userdata['host'], userdata['port'])
+    else:
+        logging.warning("MQTT connection to %s:%s lost: %s, reconnecting",
+                        userdata['host'], userdata['port'], _mqtt_reason(reason_code))
+
+
+def _get_mqtt_client():
+    """
+    Get the shared MQTT client, connecting it on first use.
+    
+    Returns:
+        Client or None: Connected (or connecting) client, or None if the
+        luigi-publish fallback should be used
+    """
+    global _MQTT_CLIENT, _MQTT_SETTINGS, _MQTT_UNAVAILABLE
+    
+    with _MQTT_LOCK:
+        if _MQTT_CLIENT is not None or _MQTT_UNAVAILABLE:
+            return _MQTT_CLIENT
+        
+        if mqtt is None:
+            logging.info("paho-mqtt not installed, publishing via luigi-publish")
+            _MQTT_UNAVAILABLE = True
+            return None
+        
+        settings = _load_broker_settings(HA_MQTT_CONFIG_FILE)
+        if settings is None:
+            logging.info("ha-mqtt broker config not available, publishing via luigi-publish")
+            _MQTT_UNAVAILABLE = True
+            return None
+        
+        try:
+            # on_disconnect takes different arguments in paho-mqtt 1.x and 2.x
+            if hasattr(mqtt, 'CallbackAPIVersion'):
+                # paho-mqtt 2.x
+                client = mqtt.Client(mqtt.CallbackAPIVersion.VERSION2,
+                                     client_id=settings['client_id'],
+                                     userdata=settings)
+                client.on_disconnect = (lambda client, userdata, flags, reason_code, properties=None:
+                                        _on_mqtt_disconnect(userdata, reason_code))
+            else:
+                client = mqtt.Client(client_id=settings['client_id'], userdata=settings)
+                client.on_disconnect = (lambda client, userdata, rc, properties=None:
+                                        _on_mqtt_disconnect(userdata, rc))
+            client.on_connect = _on_mqtt_connect
+            client.on_connect_fail = _on_mqtt_connect_fail
+            
+            if settings['username']:
+                client.username_pw_set(settings['username'], settings['password'] or None)
+            if settings['tls'] and settings['ca_cert']:
+                client.tls_set(ca_certs=settings['ca_cert'])
+            
+            client.reconnect_delay_set(settings['reconnect_min'], settings['reconnect_max'])
+            client.connect_async(settings['host'], settings['port'], settings['keepalive'])
+            client.loop_start()
+        except Exception as e:
+            logging.error("Could not start MQTT client: %s: %s", type(e).__name__, e)
+            logging.info("Publishing via luigi-publish instead")
+            _MQTT_UNAVAILABLE = True
+            return None
+        
+        logging.info("MQTT client connecting to %s:%s", settings['host'], settings['port'])
+        
+        # Give the first connection a chance to come up so that the startup
+        # publish is not just queued
+        if not _MQTT_CONNECTED.wait(settings['connect_timeout']):
+            logging.warning("MQTT not connected after %d seconds, still retrying in background",
+                            settings['connect_timeout'])
+        
+        _MQTT_SETTINGS = settings
+        _MQTT_CLIENT = client
+        return client
+
+
+def close_mqtt_client():
+    """Disconnect the shared MQTT client and stop its network thread."""
+    global _MQTT_CLIENT
+    
+    with _MQTT_LOCK:
+        client = _MQTT_CLIENT
+        _MQTT_CLIENT = None
+    
+    if client is not None:
+        try:
+            client.disconnect()
+            client.loop_stop()
+        except Exception as e:
+            logging.warning("Error closing MQTT client: %s", e)
+
+
+def _publish_with_client(client, sensor_id, value, unit=None):
+    """
+    Publish one sensor value on the shared MQTT client.
+    
+    Returns:
+        bool: True if published, False otherwise (including values that
+        are only queued until the broker connection is back)
+    """
+    topic = _MQTT_SETTINGS['state_topic'].format(sensor_id=sensor_id)
+    qos = _MQTT_SETTINGS['qos']
+    
+    try:
+        info = client.publish(topic, str(value), qos=qos)
+    except Exception as e:
+        logging.error("Unexpected error publishing %s to MQTT: %s: %s",
+                      sensor_id, type(e).__name__, e)
+        return False
+    
+    if info.rc == mqtt.MQTT_ERR_NO_CONN and qos > 0:
+        # Queued by paho and sent once the connection is (re-)established
+        logging.warning("MQTT not connected, queued %s=%s until reconnect", sensor_id, value)
+        return False
+    if info.rc != mqtt.MQTT_ERR_SUCCESS:
+        logging.warning("MQTT publish failed for %s: %s", sensor_id, mqtt.error_string(info.rc))
+        return False
+    
+    logging.debug("Published %s=%s %s to MQTT", sensor_id, value, unit or '')
+    return True
+
+
 def publish_sensor_value(sensor_id, value, unit=None):
     """
     Publish sensor value to Home Assistant via MQTT.
     
-    Optional integration with ha-mqtt module. Module works standalone
-    if ha-mqtt is not installed.
+    Uses a persistent in-process MQTT client when paho-mqtt and the ha-mqtt
+    configuration are available, otherwise runs luigi-publish. Module works
+    standalone if ha-mqtt is not installed.
+    
+    Args:
+        sensor_id: Unique sensor identifier (e.g., 'system_uptime')
+        value: Sensor value (e.g., '24.5', '45')
+        unit: Unit of measurement (e.g., 'h', '°C', '%', 'GB')
+        
+    Returns:
+        bool: True if published successfully, False otherwise
+    """
+    client = _get_mqtt_client()
+    if client is None:
+        return _publish_via_luigi_publish(sensor_id, value, unit)
+    return _publish_with_client(client, sensor_id, value, unit)
+
+
+def publish_sensor_bundle(readings):
+    """
+    Publish a batch of sensor values in a single pass.
+    
+    All values go out back-to-back on the shared MQTT connection. Each
+    sensor keeps its own state topic, which is what the Home Assistant
+    discovery configs generated by ha-mqtt subscribe to.
+    
+    Args:
+        readings: Iterable of (sensor_id, value, unit) tuples
+        
+    Returns:
+        int: Number of values published successfully
+    """
+    return sum(1 for sensor_id, value, unit in readings
+               if publish_sensor_value(sensor_id, value, unit))
+
+
+# luigi-publish argv per (sensor_id, unit), with the value slot left empty
+_LUIGI_PUBLISH_ARGV = {}
+_LUIGI_PUBLISH_VALUE_INDEX = 4
+
+
+def _publish_via_luigi_publish(sensor_id, value, unit=None):
+    """
+    Publish sensor value by running the ha-mqtt luigi-publish command.
+    
+    Used when paho-mqtt or the ha-mqtt broker configuration is unavailable.
     
     Args:
         sensor_id: Unique sensor identifier (e.g., 'system_uptime')
@@ -185,12 +552,18 @@ def publish_sensor_value(sensor_id, value, unit=None):
     """
     cmd = None
     try:
-        cmd = ['/usr/local/bin/luigi-publish', '--sensor', sensor_id, '--value', str(value)]
+        template = _LUIGI_PUBLISH_ARGV.get((sensor_id, unit))
+        if template is None:
+            template = ['/usr/local/bin/luigi-publish', '--sensor', sensor_id, '--value', None]
+            if unit:
+                template.extend(['--unit', unit])
+            _LUIGI_PUBLISH_ARGV[(sensor_id, unit)] = template
         
-        if unit:
-            cmd.extend(['--unit', unit])
+        cmd = template.copy()
+        cmd[_LUIGI_PUBLISH_VALUE_INDEX] = str(value)
         
-        logging.debug(f"Executing MQTT publish command: {' '.join(cmd)}")
+        if logging.getLogger().isEnabledFor(logging.DEBUG):
+            logging.debug("Executing MQTT publish command: %s", ' '.join(cmd))
         
         result = subprocess.run(
             cmd,
@@ -202,25 +575,25 @@ def publish_sensor_value(sensor_id, value, unit=None):
         
         # Log output if present (for debugging)
         if result.stdout:
-            logging.debug(f"luigi-publish stdout: {result.stdout.strip()}")
+            logging.debug("luigi-publish stdout: %s", result.stdout.strip())
         if result.stderr:
-            logging.debug(f"luigi-publish stderr: {result.stderr.strip()}")
+            logging.debug("luigi-publish stderr: %s", result.stderr.strip())
         
-        logging.debug(f"Published {sensor_id}={value} {unit or ''} to MQTT")
+        logging.debug("Published %s=%s %s to MQTT", sensor_id, value, unit or '')
         return True
         
     except subprocess.TimeoutExpired as e:
         # Enhanced timeout logging
-        logging.error(f"MQTT publish TIMEOUT for {sensor_id} after 10 seconds")
-        logging.error(f"Command: {' '.join(cmd) if cmd else 'unknown'}")
+        logging.error("MQTT publish TIMEOUT for %s after 10 seconds", sensor_id)
+        logging.error("Command: %s", ' '.join(cmd) if cmd else 'unknown')
         
         # Log any partial output captured before timeout
         if e.stdout:
             stdout_preview = e.stdout.decode('utf-8', errors='replace')[:500]
-            logging.error(f"Partial stdout before timeout: {stdout_preview}")
+            logging.error("Partial stdout before timeout: %s", stdout_preview)
         if e.stderr:
             stderr_preview = e.stderr.decode('utf-8', errors='replace')[:500]
-            logging.error(f"Partial stderr before timeout: {stderr_preview}")
+            logging.error("Partial stderr before timeout: %s", stderr_preview)
         
         logging.error("This indicates luigi-publish is hanging - likely MQTT broker connectivity issue")
         return False
@@ -230,11 +603,11 @@ def publish_sensor_value(sensor_id, value, unit=None):
         stderr_msg = e.stderr if e.stderr else 'no stderr'
         stdout_msg = e.stdout if e.stdout else 'no stdout'
         
-        logging.error(f"MQTT publish FAILED for {sensor_id}")
-        logging.error(f"Command: {' '.join(cmd) if cmd else 'unknown'}")
-        logging.error(f"Exit code: {e.returncode}")
-        logging.error(f"Stderr: {stderr_msg}")
-        logging.error(f"Stdout: {stdout_msg}")
+        logging.error("MQTT publish FAILED for %s", sensor_id)
+        logging.error("Command: %s", ' '.join(cmd) if cmd else 'unknown')
+        logging.error("Exit code: %s", e.returncode)
+        logging.error("Stderr: %s", stderr_msg)
+        logging.error("Stdout: %s", stdout_msg)
         return False
         
     except FileNotFoundError:
@@ -243,8 +616,9 @@ def publish_sensor_value(sensor_id, value, unit=None):
         return False
         
     except Exception as e:
-        logging.error(f"Unexpected error publishing {sensor_id} to MQTT: {type(e).__name__}: {e}")
-        logging.error(f"Command: {' '.join(cmd) if cmd else 'unknown'}")
+        logging.error("Unexpected error publishing %s to MQTT: %s: %s",
+                      sensor_id, type(e).__name__, e)
+        logging.error("Command: %s", ' '.join(cmd) if cmd else 'unknown')
         return False
 
 
@@ -252,11 +626,62 @@ def publish_sensor_value(sensor_id, value, unit=None):
 # System Metrics Collection
 # ============================================================================
 
+# Published sensors: (sensor_id, unit, log label, log unit suffix)
+METRIC_SENSORS = (
+    ('system_uptime', 'h', 'Uptime', ' hours'),
+    ('system_cpu_temp', '°C', 'CPU Temperature', '°C'),
+    ('system_memory_usage', '%', 'Memory Usage', '%'),
+    ('system_disk_usage', '%', 'Disk Usage', '%'),
+    ('system_cpu_usage', '%', 'CPU Usage', '%'),
+)
+
+
+_MEM_TOTAL_RE = re.compile(rb'^MemTotal:\s+(\d+)', re.MULTILINE)
+_MEM_AVAILABLE_RE = re.compile(rb'^MemAvailable:\s+(\d+)', re.MULTILINE)
+_TEMP_RE = re.compile(rb"temp=([\d.]+)")
+
+
+def _read_small_file(path, size=64):
+    """
+    Read a small kernel pseudo-file (procfs/sysfs) with a single read.
+    
+    Args:
+        path: File path
+        size: Maximum number of bytes to read
+        
+    Returns:
+        bytes: File contents
+    """
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        return os.read(fd, size)
+    finally:
+        os.close(fd)
+
+
 class SystemMetrics:
     """Collects system information metrics."""
     
-    @staticmethod
-    def get_uptime_hours():
+    __slots__ = ('_cpu_percent', '_cpu_sampled', '_collectors', '_values')
+    
+    # Whether vcgencmd is installed; None until the first lookup
+    _vcgencmd_available = None
+    
+    def __init__(self):
+        """Initialize metric collectors and the reusable result dict."""
+        self._cpu_percent = psutil.cpu_percent
+        self._cpu_sampled = False
+        
+        self._collectors = (
+            ('system_uptime', self.get_uptime_hours),
+            ('system_cpu_temp', self.get_cpu_temperature),
+            ('system_memory_usage', self.get_memory_usage_percent),
+            ('system_disk_usage', self.get_disk_usage_percent),
+            ('system_cpu_usage', self.get_cpu_usage_percent),
+        )
+        self._values = dict.fromkeys(sensor_id for sensor_id, _ in self._collectors)
+    
+    def get_uptime_hours(self):
         """
         Get system uptime in hours.
         
@@ -264,93 +689,143 @@ class SystemMetrics:
             float: Uptime in hours, or None if unable to read
         """
         try:
-            with open('/proc/uptime', 'r') as f:
-                uptime_seconds = float(f.read().split()[0])
-                return round(uptime_seconds / 3600, 2)
-        except Exception as e:
+            uptime_seconds = float(_read_small_file('/proc/uptime').split(b' ', 1)[0])
+            return round(uptime_seconds / 3600, 2)
+        except (OSError, ValueError) as e:
             logging.error(f"Error reading uptime: {e}")
             return None
     
-    @staticmethod
-    def get_cpu_temperature():
+    def get_cpu_temperature(self):
         """
-        Get CPU temperature in Celsius using vcgencmd (Raspberry Pi specific).
-        Falls back to thermal zone if vcgencmd not available.
+        Get CPU temperature in Celsius from the kernel thermal zone.
+        Falls back to vcgencmd (Raspberry Pi specific) if the thermal zone
+        is not available.
         
         Returns:
             float: CPU temperature in Celsius, or None if unable to read
         """
-        # Try vcgencmd first (Raspberry Pi specific)
+        # Try thermal zone first (no subprocess needed)
+        try:
+            temp_millidegrees = int(_read_small_file('/sys/class/thermal/thermal_zone0/temp'))
+            return round(temp_millidegrees / 1000.0, 1)
+        except (OSError, ValueError):
+            pass
+        
+        # Fall back to vcgencmd, unless an earlier call found it missing
+        if SystemMetrics._vcgencmd_available is False:
+            logging.error("Error reading CPU temperature: no thermal zone or vcgencmd available")
+            return None
+        
         try:
             result = subprocess.run(
                 ['vcgencmd', 'measure_temp'],
                 capture_output=True,
                 timeout=2,
-                check=True,
-                text=True
+                check=True
             )
+            SystemMetrics._vcgencmd_available = True
             # Output format: temp=45.2'C
-            temp_str = result.stdout.strip()
-            temp = float(temp_str.split('=')[1].split("'")[0])
-            return round(temp, 1)
-        except (subprocess.CalledProcessError, subprocess.TimeoutExpired, 
-                FileNotFoundError, ValueError, IndexError):
-            pass
-        
-        # Fall back to thermal zone
-        try:
-            with open('/sys/class/thermal/thermal_zone0/temp', 'r') as f:
-                temp_millidegrees = int(f.read().strip())
-                return round(temp_millidegrees / 1000.0, 1)
-        except Exception as e:
+            match = _TEMP_RE.search(result.stdout)
+            if match is None:
+                logging.error("Error reading CPU temperature: unexpected vcgencmd output %r",
+                              result.stdout)
+                return None
+            return round(float(match.group(1)), 1)
+        except FileNotFoundError:
+            SystemMetrics._vcgencmd_available = False
+            logging.error("Error reading CPU temperature: no thermal zone or vcgencmd available")
+            return None
+        except (OSError, subprocess.SubprocessError, ValueError) as e:
             logging.error(f"Error reading CPU temperature: {e}")
             return None
     
-    @staticmethod
-    def get_memory_usage_percent():
+    def get_memory_usage_percent(self):
         """
-        Get memory usage percentage using psutil.
+        Get memory usage percentage from /proc/meminfo.
+        
+        Memory counted as used is MemTotal - MemAvailable, the same
+        definition psutil uses.
         
         Returns:
             float: Memory usage percentage, or None if unable to read
         """
         try:
-            memory = psutil.virtual_memory()
-            return round(memory.percent, 1)
-        except Exception as e:
+            # MemTotal and MemAvailable are within the first few lines
+            meminfo = _read_small_file('/proc/meminfo', 512)
+            total = int(_MEM_TOTAL_RE.search(meminfo).group(1))
+            available = int(_MEM_AVAILABLE_RE.search(meminfo).group(1))
+            return round((total - available) * 100.0 / total, 1)
+        except (OSError, ValueError, AttributeError) as e:
+            # AttributeError: MemTotal/MemAvailable missing from meminfo
             logging.error(f"Error reading memory usage: {e}")
             return None
     
-    @staticmethod
-    def get_disk_usage_percent():
+    def get_disk_usage_percent(self):
         """
-        Get root filesystem disk usage percentage using psutil.
+        Get root filesystem disk usage percentage using statvfs.
+        
+        Like df, the percentage excludes blocks reserved for root.
         
         Returns:
             float: Disk usage percentage, or None if unable to read
         """
         try:
-            disk = psutil.disk_usage('/')
-            return round(disk.percent, 1)
-        except Exception as e:
+            st = os.statvfs('/')
+            used = st.f_blocks - st.f_bfree
+            return round(used * 100.0 / (used + st.f_bavail), 1)
+        except (OSError, ZeroDivisionError) as e:
             logging.error(f"Error reading disk usage: {e}")
             return None
     
-    @staticmethod
-    def get_cpu_usage_percent():
+    def get_cpu_usage_percent(self):
         """
-        Get CPU usage percentage (averaged over 1 second) using psutil.
+        Get CPU usage percentage since the previous call using psutil.
+        
+        The first call has no previous sample to compare against, so it
+        measures over a 1 second interval. Every later call is non-blocking
+        and returns the average load since the previous one, i.e. over the
+        last publish interval.
         
         Returns:
             float: CPU usage percentage, or None if unable to read
         """
         try:
-            # Get CPU usage over 1 second interval
-            cpu_percent = psutil.cpu_percent(interval=1)
+            if self._cpu_sampled:
+                cpu_percent = self._cpu_percent(interval=None)
+            else:
+                cpu_percent = self._cpu_percent(interval=1)
+                self._cpu_sampled = True
             return round(cpu_percent, 1)
-        except Exception as e:
+        except OSError as e:
             logging.error(f"Error reading CPU usage: {e}")
             return None
+    
+    def collect_all(self, executor=None):
+        """
+        Collect all system metrics.
+        
+        The returned dict is reused and overwritten by the next call.
+        
+        Args:
+            executor: Optional concurrent.futures executor; when given, the
+                collectors run concurrently on it
+        
+        Returns:
+            dict: Metric value (or None if unavailable) keyed by sensor ID
+        """
+        values = self._values
+        
+        if executor is None:
+            for sensor_id, collect in self._collectors:
+                values[sensor_id] = collect()
+            return values
+        
+        futures = [(sensor_id, executor.submit(collect))
+                   for sensor_id, collect in self._collectors]
+        concurrent.futures.wait([future for _, future in futures])
+        for sensor_id, future in futures:
+            values[sensor_id] = future.result()
+        return values
 
 
 # ============================================================================
@@ -369,7 +844,16 @@ class SystemInfoMonitor:
         """
         self.config = config
         self.running = False
-        self.last_publish_time = None
+        self._next_publish = None
+        self._stop_event = threading.Event()
+        
+        self.metrics = SystemMetrics()
+        
+        # Worker threads for collecting metrics concurrently (one per metric)
+        self._pool = concurrent.futures.ThreadPoolExecutor(
+            max_workers=len(METRIC_SENSORS),
+            thread_name_prefix='metrics'
+        )
         
         # Setup signal handlers
         signal.signal(signal.SIGTERM, self._signal_handler)
@@ -380,71 +864,25 @@ class SystemInfoMonitor:
         sig_name = signal.Signals(signum).name
         logging.info(f"Received {sig_name}, initiating graceful shutdown...")
         self.running = False
+        self._stop_event.set()
     
     def collect_and_publish_metrics(self):
         """Collect all system metrics and publish to MQTT."""
         logging.info("Collecting system metrics...")
         
-        metrics_collected = 0
-        metrics_published = 0
-        
-        # Collect and publish uptime
-        uptime = SystemMetrics.get_uptime_hours()
-        if uptime is not None:
-            metrics_collected += 1
-            logging.info(f"Uptime: {uptime} hours")
-            if publish_sensor_value('system_uptime', uptime, unit='h'):
-                metrics_published += 1
-        
-        # Collect and publish CPU temperature
-        cpu_temp = SystemMetrics.get_cpu_temperature()
-        if cpu_temp is not None:
-            metrics_collected += 1
-            logging.info(f"CPU Temperature: {cpu_temp}°C")
-            if publish_sensor_value('system_cpu_temp', cpu_temp, unit='°C'):
-                metrics_published += 1
-        
-        # Collect and publish memory usage
-        memory_usage = SystemMetrics.get_memory_usage_percent()
-        if memory_usage is not None:
-            metrics_collected += 1
-            logging.info(f"Memory Usage: {memory_usage}%")
-            if publish_sensor_value('system_memory_usage', memory_usage, unit='%'):
-                metrics_published += 1
-        
-        # Collect and publish disk usage
-        disk_usage = SystemMetrics.get_disk_usage_percent()
-        if disk_usage is not None:
-            metrics_collected += 1
-            logging.info(f"Disk Usage: {disk_usage}%")
-            if publish_sensor_value('system_disk_usage', disk_usage, unit='%'):
-                metrics_published += 1
-        
-        # Collect and publish CPU usage
-        cpu_usage = SystemMetrics.get_cpu_usage_percent()
-        if cpu_usage is not None:
-            metrics_collected += 1
-            logging.info(f"CPU Usage: {cpu_usage}%")
-            if publish_sensor_value('system_cpu_usage', cpu_usage, unit='%'):
-                metrics_published += 1
-        
-        logging.info(f"Metrics: {metrics_collected} collected, {metrics_published} published")
-        
-        # Update last publish time
-        self.last_publish_time = time.time()
-    
-    def should_publish(self):
-        """
-        Check if it's time to publish metrics.
+        metrics = self.metrics.collect_all(self._pool)
         
-        Returns:
-            bool: True if should publish, False otherwise
-        """
-        if self.last_publish_time is None:
-            return True
+        readings = []
+        for sensor_id, unit, label, suffix in METRIC_SENSORS:
+            value = metrics[sensor_id]
+            if value is not None:
+                logging.info("%s: %s%s", label, value, suffix)
+                readings.append((sensor_id, value, unit))
         
-        elapsed = time.time() - self.last_publish_time
-        return elapsed >= self.config.PUBLISH_INTERVAL
+        metrics_collected = len(readings)
+        metrics_published = publish_sensor_bundle(readings)
+        
+        logging.info("Metrics: %d collected, %d published", metrics_collected, metrics_published)
     
     def run(self):
         """Main application loop."""
@@ -459,20 +897,19 @@ class SystemInfoMonitor:
         except Exception as e:
             logging.error(f"Error during initial metrics collection: {e}")
         
-        # Main loop
-        while self.running:
+        self._next_publish = time.monotonic() + self.config.PUBLISH_INTERVAL
+        
+        # Main loop: sleep until the next publish is due (returns early on shutdown)
+        while not self._stop_event.wait(max(0.0, self._next_publish - time.monotonic())):
             try:
-                # Check if it's time to publish
-                if self.should_publish():
-                    self.collect_and_publish_metrics()
-                
-                # Sleep before next check
-                time.sleep(self.config.MAIN_LOOP_SLEEP)
-                
+                self.collect_and_publish_metrics()
             except Exception as e:
                 logging.error(f"Error in main loop: {e}")
-                time.sleep(self.config.MAIN_LOOP_SLEEP)
+            
+            self._next_publish = time.monotonic() + self.config.PUBLISH_INTERVAL
         
+        self._pool.shutdown()
+        close_mqtt_client()
         logging.info("System Info Monitor stopped")
 
 